@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional
 
 @dataclass
@@ -17,4 +17,24 @@ class SearchResult:
 class ChatMessage:
     role: str  # 'user' or 'assistant'
     content: str
-    timestamp: Optional[str] = None
\ No newline at end of file
+    timestamp: Optional[str] = None
+
+@dataclass
+class ContentChunks:
+    """Parsed content chunks stored column-wise; row i of each list is chunk i."""
+    content: List[str] = field(default_factory=list)
+    context: List[str] = field(default_factory=list)
+    type: List[str] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.content)
+    
+    def append(self, content: str, context: str, content_type: str):
+        self.content.append(content)
+        self.context.append(context)
+        self.type.append(content_type)
+    
+    def extend(self, other: "ContentChunks"):
+        self.content.extend(other.content)
+        self.context.extend(other.context)
+        self.type.extend(other.type)
\ No newline at end of file
@@ -1,13 +1,7 @@
-import sys
-from pathlib import Path
 from typing import List, Optional
 
-# Add backend to path
-backend_path = Path(__file__).parent.parent
-sys.path.append(str(backend_path))
-
-from services.semantic_search import SemanticSearch
-from models.qa_model import ChatMessage, SearchResult
+from .semantic_search import SemanticSearch
+from ..models.qa_model import ChatMessage, SearchResult
 
 class ChatbotService:
     def __init__(self):
@@ -25,15 +19,16 @@ class ChatbotService:
             print(f"Error initializing chatbot service: {e}")
             return False
     
-    def process_query(self, query: str) -> str:
+    def process_query(self, query: str, threshold: Optional[float] = None) -> str:
         if not self.initialized or not self.search_engine:
             return "Chatbot service is not initialized properly."
         
         try:
-            response = self.search_engine.search(query)
+            # A per-query threshold leaves the shared engine's own setting alone
+            response = self.search_engine.search(query, threshold=threshold)
             return response
         except Exception as e:
-            return f"Error processing query: {e}"
+            return f"{SemanticSearch.ERROR}: {e}"
     
     def get_stats(self) -> str:
         if self.search_engine:
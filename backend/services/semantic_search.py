@@ -1,23 +1,157 @@
-import pandas as pd
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-import pickle
+import functools
+import hashlib
+import json
 import os
-import sys
+import pickle
+import threading
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
+
+# pandas, sentence_transformers (and with it torch) are imported where they are
+# first needed so that importing this module stays cheap
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+from ..models.qa_model import QAPair, SearchResult, ContentChunks
+from ..utils.config import QA_CSV_PATH, EMBEDDINGS_DIR, DEFAULT_MODEL, DEFAULT_THRESHOLD, DATA_DIR, EMBEDDING_PRECISION
+from ..utils.config import BINARY_PREFILTER_MIN_SIZE, BINARY_RESCORE_CANDIDATES, QUANTIZE_ENCODER, QUERY_CACHE_SIZE
+from ..utils.config import EMBEDDING_BATCH_SIZE, MAX_SEQ_LENGTH, ENCODER_BACKEND, ONNX_MODEL_FILE
+from ..utils.config import ANN_INDEX_MIN_SIZE, HNSW_M, HNSW_EF_CONSTRUCTION, HNSW_EF_SEARCH
+from ..utils.config import IVFPQ_MIN_SIZE, IVFPQ_M, IVFPQ_NBITS, ANN_RESCORE_CANDIDATES
+from ..utils.config import RESPONSE_CACHE_SIMILARITY, RESPONSE_CACHE_SIZE
+from ..utils.content_parser import ContentParser
+from ..utils.version_manager import version_manager, SystemPhase
+
+# Arrays persisted alongside the metadata sidecar, one .npy file each
+EMBEDDING_ARRAYS = ('embeddings', 'emb_q', 'emb_scales', 'emb_bin')
+
+# Serializes encode() calls: load_encoder hands every instance the same model,
+# whose fast tokenizer is not safe to call from several threads at once
+# ("Already borrowed"). One forward pass at a time also keeps torch's intra-op
+# threads from being multiplied by the callers' thread pools.
+_ENCODE_LOCK = threading.Lock()
+
+def quantize_int8(embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetrically quantize each row to int8.
+
+    Returns:
+        Tuple of (int8 codes, float32 per-row scales shaped (N, 1)) such that
+        ``codes * scales`` approximates the input.
+    """
+    scales = (np.abs(embeddings).max(axis=1, keepdims=True) / 127.0).clip(min=1e-12).astype(np.float32)
+    codes = np.round(embeddings / scales).clip(-127, 127).astype(np.int8)
+    return codes, scales
+
+def _fused_best_match(embeddings, query):
+    """Dot product and argmax in one streaming pass over the rows."""
+    best_idx = -1
+    best_score = -np.inf
+    for i in range(embeddings.shape[0]):
+        score = 0.0
+        for j in range(embeddings.shape[1]):
+            score += embeddings[i, j] * query[j]
+        if score > best_score:
+            best_score = score
+            best_idx = i
+    return best_idx, best_score
+
+def _fused_best_match_int8(codes, scales, query_codes):
+    """Int8 variant: integer dot product per row, rescaled before comparing."""
+    best_idx = -1
+    best_score = -np.inf
+    for i in range(codes.shape[0]):
+        acc = 0
+        for j in range(codes.shape[1]):
+            acc += np.int32(codes[i, j]) * np.int32(query_codes[j])
+        score = acc * scales[i]
+        if score > best_score:
+            best_score = score
+            best_idx = i
+    return best_idx, best_score
 
-# Add backend to path
-backend_path = Path(__file__).parent.parent
-sys.path.append(str(backend_path))
+# fastmath without 'ninf'/'nnan': the fused kernel seeds its running best with
+# -inf and compares against it, which those flags would make undefined
+_FASTMATH = {'reassoc', 'contract', 'nsz', 'arcp'}
+
+@functools.lru_cache(maxsize=None)
+def _compiled_kernels():
+    """numba-compiled fused kernels, or None when numba is not installed.
+    
+    numba is optional and slow to import, so it is only pulled in by the
+    first search rather than when this module loads.
+    """
+    try:
+        from numba import njit
+    except ImportError:  # search falls back to NumPy matmul + argmax
+        return None
+    
+    return (
+        njit(cache=True, fastmath=_FASTMATH)(_fused_best_match),
+        njit(cache=True)(_fused_best_match_int8)
+    )
+
+@functools.lru_cache(maxsize=None)
+def _faiss():
+    """The faiss module, or None when it is not installed.
+    
+    Like numba, faiss is optional and only imported once a corpus is large
+    enough to be indexed.
+    """
+    try:
+        import faiss
+    except ImportError:  # search falls back to the exact scan
+        return None
+    return faiss
+
+@functools.lru_cache(maxsize=4)
+def load_encoder(model_name: str) -> Tuple["SentenceTransformer", str]:
+    """Load the sentence encoder using the fastest configured CPU path.
+    
+    Prefers the pre-quantized ONNX export when ENCODER_BACKEND is "onnx" and
+    falls back to PyTorch (dynamically quantized if QUANTIZE_ENCODER is set).
+    Encoders are cached per model name, so every SemanticSearch in the
+    process shares one copy of the weights.
+    
+    Returns:
+        Tuple of (model, encoder id) where the id names the exact weights
+        and backend, so stored embeddings can be matched to their encoder
+    """
+    from sentence_transformers import SentenceTransformer
+    
+    if ENCODER_BACKEND == "onnx":
+        try:
+            model = SentenceTransformer(model_name, backend="onnx", model_kwargs={"file_name": ONNX_MODEL_FILE})
+            return model, f"{model_name}+onnx:{ONNX_MODEL_FILE}"
+        except Exception as e:
+            print(f"ONNX backend unavailable ({e}), falling back to PyTorch")
+    
+    model = SentenceTransformer(model_name)
+    if QUANTIZE_ENCODER and model.device.type == "cpu":
+        _quantize_encoder(model)
+        return model, f"{model_name}+qint8"
+    return model, model_name
 
-from models.qa_model import QAPair, SearchResult
-from utils.config import QA_CSV_PATH, EMBEDDINGS_PATH, DEFAULT_MODEL, DEFAULT_THRESHOLD, DATA_DIR
-from utils.content_parser import ContentParser
-from utils.version_manager import version_manager, SystemPhase
+def _quantize_encoder(model: "SentenceTransformer"):
+    """Swap the transformer's Linear layers for dynamically quantized int8 ones."""
+    import torch
+    
+    transformer = model._first_module()
+    transformer.auto_model = torch.quantization.quantize_dynamic(
+        transformer.auto_model, {torch.nn.Linear}, dtype=torch.qint8
+    )
 
 class SemanticSearch:
+    # Every below-threshold response starts with NO_INFO and every failed
+    # search with ERROR; callers use is_answer() rather than matching strings
+    NO_INFO = "I'm sorry, I don't have enough information to answer that question."
+    ERROR = "Error processing query"
+    
+    @classmethod
+    def is_answer(cls, response: str) -> bool:
+        """True if a search response is an actual answer (neither NO_INFO nor ERROR)."""
+        return not response.startswith((cls.NO_INFO, cls.ERROR))
+    
     def __init__(self, content_file=None, csv_path=None, model_name=None, threshold=None, force_phase=None):
         # Version-aware initialization
         self.forced_phase = force_phase
@@ -29,12 +163,28 @@ class SemanticSearch:
         self.content_file = content_file or str(DATA_DIR / "content.txt")
         self.csv_path = csv_path or str(QA_CSV_PATH)
         self.model_name = model_name or DEFAULT_MODEL
+        # Semantic response cache (top-1 answers by query vector), shared across threads
+        self._response_lock = threading.Lock()
+        self._response_vectors = None  # ring buffer of answered query vectors
+        self._responses: List[str] = []
+        self._response_slot = 0
         self.threshold = threshold or phase_config.threshold
         self.model = None
+        self.encoder_id = None  # identifies the exact encoder the stored embeddings must come from
+        self._lowercase_queries = False  # safe to fold case only for uncased tokenizers
+        self._query_cache = functools.lru_cache(maxsize=QUERY_CACHE_SIZE)(self._encode_query_uncached)
         self.df = None  # Keep for backward compatibility with existing CSV data
-        self.content_chunks = []  # New: store parsed content chunks
+        self.answers = None  # CSV answers aligned with the embedding rows (all search reads)
+        self.content_chunks = ContentChunks()  # New: store parsed content chunks (column-wise)
         self.embeddings = None
-        self.embeddings_path = str(EMBEDDINGS_PATH)
+        self.emb_q = None  # int8 codes of the embeddings when EMBEDDING_PRECISION is "int8"
+        self.emb_scales = None
+        self.emb_bin = None  # packed sign bits for the Hamming prefilter on large corpora
+        self.index = None  # FAISS HNSW / IVF-PQ index over the embeddings for large corpora
+        self._index_rescore = False  # index scores are approximate and get rescored exactly
+        # Set per corpus by _use_cache_key once data and model are loaded
+        self.embeddings_path = None
+        self.embeddings_meta_path = None
         self.content_parser = ContentParser()
         
         # Determine operational mode based on phase
@@ -71,7 +221,10 @@ class SemanticSearch:
         # Fallback to CSV or load both
         if not self.use_content_mode or not success:
             try:
+                import pandas as pd
+                
                 self.df = pd.read_csv(self.csv_path)
+                self.answers = self.df['Answer'].to_numpy()  # search indexes this, not the DataFrame
                 print(f"Loaded {len(self.df)} Q&A pairs from {self.csv_path}")
                 success = True
             except FileNotFoundError:
@@ -85,53 +238,132 @@ class SemanticSearch:
     
     def load_model(self):
         try:
+            # load_encoder is cached, so instances with the same model share one encoder
             print("Loading sentence transformer model...")
-            self.model = SentenceTransformer(self.model_name)
+            self.model, self.encoder_id = load_encoder(self.model_name)
+            self.model.max_seq_length = min(self.model.max_seq_length, MAX_SEQ_LENGTH)
+            
+            self._lowercase_queries = getattr(self.model.tokenizer, 'do_lower_case', False)
+            self._query_cache.cache_clear()
+            self._clear_response_cache()
+            
             print("Model loaded successfully!")
             return True
         except Exception as e:
             print(f"Error loading model: {e}")
             return False
     
+    def _encode_query_uncached(self, query: str) -> np.ndarray:
+        """Encode one query to a read-only, normalized float32 vector."""
+        with _ENCODE_LOCK:
+            query_embedding = self.model.encode(
+                [query], convert_to_numpy=True, normalize_embeddings=True
+            )
+        query_embedding = np.ascontiguousarray(query_embedding[0], dtype=np.float32)
+        query_embedding.flags.writeable = False  # shared by every later hit on the cache
+        return query_embedding
+    
+    def _query_key(self, query: str) -> str:
+        """Normalize a query so trivially different spellings share an embedding."""
+        key = ' '.join(query.split())
+        if self._lowercase_queries:
+            key = key.lower()
+        return key
+    
+    def _encode_query(self, query: str) -> np.ndarray:
+        """Encode a query, reusing the cached vector for repeated questions."""
+        return self._query_cache(self._query_key(query))
+    
+    def _encode_queries(self, queries: List[str]) -> np.ndarray:
+        """Encode many queries in one batched forward pass; returns (Q, D) normalized float32."""
+        keys = [self._query_key(query) for query in queries]
+        unique_keys = list(dict.fromkeys(keys))
+        with _ENCODE_LOCK:
+            embeddings = self.model.encode(
+                unique_keys,
+                batch_size=EMBEDDING_BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if len(unique_keys) == len(keys):
+            return embeddings
+        position = {key: i for i, key in enumerate(unique_keys)}
+        return embeddings[[position[key] for key in keys]]
+    
+    def _encode_corpus(self, texts: List[str]) -> np.ndarray:
+        """Encode corpus texts straight to normalized, C-contiguous float32 rows."""
+        with _ENCODE_LOCK:
+            embeddings = self.model.encode(
+                texts,
+                batch_size=EMBEDDING_BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
+    
+    def _corpus(self) -> Tuple[Optional[str], List[str]]:
+        """Mode and texts that the embedding rows are built from, or (None, []) without data."""
+        if self.use_content_mode and self.content_chunks:
+            return 'content', self.content_chunks.content
+        if self.df is not None:
+            return 'csv', self.df['Question'].tolist()
+        return None, []
+    
+    def _use_cache_key(self, mode: str, texts: List[str]):
+        """Point the embedding paths at the cache entry for this encoder, mode and corpus.
+        
+        The key is a SHA-1 over the encoder id, the mode and every text, so
+        changed content or a different encoder simply maps to a new entry.
+        """
+        digest = hashlib.sha1()
+        digest.update(f"{self.encoder_id or self.model_name}\0{mode}\0".encode('utf-8'))
+        for text in texts:
+            digest.update(text.encode('utf-8'))
+            digest.update(b"\0")
+        key = digest.hexdigest()
+        self.embeddings_path = str(EMBEDDINGS_DIR / f"{key}.npy")
+        self.embeddings_meta_path = str(EMBEDDINGS_DIR / f"{key}.meta.json")
+    
     def generate_embeddings(self):
-        """Generate embeddings for content chunks or CSV questions."""
+        """Generate embeddings for content chunks or CSV questions.
+        
+        Embeddings cached on disk for the exact same corpus and encoder are
+        memory-mapped instead of re-encoded.
+        """
         if self.model is None:
             print("Model not loaded")
             return False
+        
+        if self.load_embeddings():
+            return True
             
         try:
-            if self.use_content_mode and self.content_chunks:
-                print("Generating embeddings for content chunks...")
-                texts = [chunk['content'] for chunk in self.content_chunks]
-                self.embeddings = self.model.encode(texts)
-                
-                # Save embeddings with content data
-                embedding_data = {
-                    'embeddings': self.embeddings,
-                    'content_chunks': self.content_chunks,
-                    'mode': 'content',
-                    'model_name': self.model_name
-                }
-                
-            elif self.df is not None:
-                print("Generating embeddings for CSV questions...")
-                questions = self.df['Question'].tolist()
-                self.embeddings = self.model.encode(questions)
-                
-                # Save embeddings with CSV data for backward compatibility
-                embedding_data = {
-                    'embeddings': self.embeddings,
-                    'df_data': self.df.to_dict('records'),
-                    'mode': 'csv',
-                    'model_name': self.model_name
-                }
-            else:
+            mode, texts = self._corpus()
+            if mode is None:
                 print("No data available for embedding generation")
                 return False
             
-            # Save to disk
-            with open(self.embeddings_path, 'wb') as f:
-                pickle.dump(embedding_data, f)
+            if mode == 'content':
+                print("Generating embeddings for content chunks...")
+            else:
+                print("Generating embeddings for CSV questions...")
+            self.embeddings = self._encode_corpus(texts)
+            
+            # The rows line up with the loaded data, so the sidecar only describes them
+            embedding_data = {
+                'mode': mode,
+                'rows': len(texts),
+                'model_name': self.model_name,
+                'encoder': self.encoder_id
+            }
+            
+            self._prepare_quantized()
+            self._build_index()
+            self._clear_response_cache()
+            self._save_embeddings(embedding_data)
             print(f"Embeddings generated and saved to {self.embeddings_path}")
             return True
             
@@ -139,37 +371,269 @@ class SemanticSearch:
             print(f"Error generating embeddings: {e}")
             return False
     
+    def _array_path(self, name: str) -> Path:
+        """Path of the .npy file holding one of the stored embedding arrays."""
+        if name == 'embeddings':
+            return Path(self.embeddings_path)
+        return Path(self.embeddings_path).with_suffix(f".{name}.npy")
+    
+    def _save_embeddings(self, metadata: Dict):
+        """Write each embedding array as .npy and the metadata as a JSON sidecar.
+        
+        The sidecar is removed first and written last so a partially written
+        set is never loaded; stale arrays from a previous layout are deleted.
+        """
+        Path(self.embeddings_meta_path).unlink(missing_ok=True)
+        
+        for name in EMBEDDING_ARRAYS:
+            array = getattr(self, name)
+            if array is not None:
+                np.save(self._array_path(name), array)
+            else:
+                self._array_path(name).unlink(missing_ok=True)
+        
+        with open(self.embeddings_meta_path, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+    
     def load_embeddings(self):
-        """Load embeddings and associated data from disk."""
-        if os.path.exists(self.embeddings_path):
+        """Memory-map the cached embeddings for the currently loaded data, if any."""
+        mode, texts = self._corpus()
+        if mode is None:
+            return False
+        self._use_cache_key(mode, texts)
+        
+        if os.path.exists(self.embeddings_meta_path) and os.path.exists(self.embeddings_path):
             try:
-                with open(self.embeddings_path, 'rb') as f:
-                    data = pickle.load(f)
+                with open(self.embeddings_meta_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
                 
-                # Handle new format with embedded content
-                if isinstance(data, dict) and 'embeddings' in data:
-                    self.embeddings = data['embeddings']
-                    
-                    if data.get('mode') == 'content' and 'content_chunks' in data:
-                        self.content_chunks = data['content_chunks']
-                        self.use_content_mode = True
-                        print(f"Loaded pre-computed embeddings for {len(self.content_chunks)} content chunks")
-                    elif data.get('mode') == 'csv' and 'df_data' in data:
-                        self.df = pd.DataFrame(data['df_data'])
-                        self.use_content_mode = False
-                        print(f"Loaded pre-computed embeddings for {len(self.df)} CSV entries")
-                    
-                # Handle legacy format (just embeddings array)
-                else:
-                    self.embeddings = data
-                    print("Loaded legacy embeddings format")
+                # Memory-map the arrays: they were saved normalized and contiguous
+                arrays = {
+                    name: np.load(path, mmap_mode='r')
+                    for name in EMBEDDING_ARRAYS
+                    if (path := self._array_path(name)).exists()
+                }
+                if data.get('rows') != len(texts) or len(arrays['embeddings']) != len(texts):
+                    print("Stored embeddings do not match the loaded data, regenerating...")
+                    return False
+                
+                # No-op for files written by _save_embeddings; guards the BLAS fast path otherwise
+                self.embeddings = np.ascontiguousarray(arrays['embeddings'], dtype=np.float32)
+                self._prepare_quantized(arrays.get('emb_q'), arrays.get('emb_scales'), arrays.get('emb_bin'))
+                self._build_index()
+                self._clear_response_cache()
                 
+                if mode == 'content':
+                    print(f"Loaded pre-computed embeddings for {len(texts)} content chunks")
+                else:
+                    print(f"Loaded pre-computed embeddings for {len(texts)} CSV entries")
                 return True
                 
             except Exception as e:
                 print(f"Error loading embeddings: {e}")
         return False
     
+    def _prepare_quantized(self, emb_q=None, emb_scales=None, emb_bin=None):
+        """Set up the int8 and binary copies of the embeddings.
+        
+        The int8 copy follows EMBEDDING_PRECISION; the binary codes are only
+        kept for corpora of at least BINARY_PREFILTER_MIN_SIZE rows that are
+        scanned exactly, since a FAISS index answers every query before them.
+        """
+        n_rows = len(self.embeddings)
+        
+        if EMBEDDING_PRECISION != "int8":
+            self.emb_q = self.emb_scales = None
+        elif emb_q is not None and emb_scales is not None and len(emb_q) == n_rows:
+            self.emb_q, self.emb_scales = emb_q, emb_scales
+        else:
+            self.emb_q, self.emb_scales = quantize_int8(self.embeddings)
+        
+        if n_rows < BINARY_PREFILTER_MIN_SIZE or self._uses_ann_index():
+            self.emb_bin = None
+        elif emb_bin is not None and len(emb_bin) == n_rows:
+            self.emb_bin = emb_bin
+        else:
+            self.emb_bin = np.packbits(self.embeddings > 0, axis=1)
+    
+    def _uses_ann_index(self) -> bool:
+        """True when _build_index builds a FAISS index for the current embeddings."""
+        return len(self.embeddings) >= ANN_INDEX_MIN_SIZE and _faiss() is not None
+    
+    def _build_index(self):
+        """Build the FAISS index for corpora of at least ANN_INDEX_MIN_SIZE rows.
+        
+        Leaves self.index as None (exact scan) for smaller corpora or when
+        faiss is not installed. The embeddings are already unit length, so
+        inner product is the cosine similarity. Up to IVFPQ_MIN_SIZE rows the
+        index is an HNSW graph, storing scalar-quantized vectors with
+        EMBEDDING_PRECISION "int8" (8-bit) or "float16"; larger corpora use IVF-PQ.
+        Either index is saved next to the cached embeddings and read back on
+        later runs instead of being rebuilt (or, for IVF-PQ, retrained).
+        """
+        self.index = None
+        self._index_rescore = False
+        if not self._uses_ann_index():
+            return
+        faiss = _faiss()
+        n_rows = len(self.embeddings)
+        
+        dimension = self.embeddings.shape[1]
+        vectors = np.ascontiguousarray(self.embeddings)
+        if n_rows > IVFPQ_MIN_SIZE and dimension % IVFPQ_M == 0:
+            nlist = int(np.sqrt(n_rows) * 2)
+            kind = f"ivfpq-{nlist}-{IVFPQ_M}x{IVFPQ_NBITS}"
+            index = self._read_index(faiss, kind)
+            if index is None:
+                quantizer = faiss.IndexFlatIP(dimension)
+                index = faiss.IndexIVFPQ(quantizer, dimension, nlist, IVFPQ_M, IVFPQ_NBITS,
+                                         faiss.METRIC_INNER_PRODUCT)
+                index.train(vectors)  # k-means for the lists plus the PQ codebooks
+                index.add(vectors)
+                self._write_index(faiss, index, kind)
+            index.nprobe = max(1, nlist // 10)
+            self.index = index
+            self._index_rescore = True
+            return
+        
+        scalar_quantizers = {
+            "int8": faiss.ScalarQuantizer.QT_8bit,
+            "float16": faiss.ScalarQuantizer.QT_fp16,
+        }
+        self._index_rescore = EMBEDDING_PRECISION in scalar_quantizers
+        kind = f"hnsw-{EMBEDDING_PRECISION}-m{HNSW_M}-efc{HNSW_EF_CONSTRUCTION}"
+        index = self._read_index(faiss, kind)
+        if index is None:
+            if self._index_rescore:
+                index = faiss.IndexHNSWSQ(dimension, scalar_quantizers[EMBEDDING_PRECISION], HNSW_M,
+                                          faiss.METRIC_INNER_PRODUCT)
+                index.train(vectors)  # learns the per-dimension ranges (a no-op for fp16)
+            else:
+                index = faiss.IndexHNSWFlat(dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+            index.add(vectors)
+            self._write_index(faiss, index, kind)
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+        self.index = index
+    
+    def _index_path(self, kind: str) -> Optional[Path]:
+        """Cache file for a FAISS index of the given kind next to <key>.npy, or None without a cache key."""
+        if self.embeddings_path is None:
+            return None
+        return Path(self.embeddings_path).with_suffix(f".{kind}.faiss")
+    
+    def _read_index(self, faiss, kind: str):
+        """The cached FAISS index of this kind for the current embeddings, or None."""
+        path = self._index_path(kind)
+        if path is None or not path.exists():
+            return None
+        try:
+            index = faiss.read_index(str(path))
+        except Exception as e:
+            print(f"Error loading FAISS index: {e}")
+            return None
+        if index.ntotal != len(self.embeddings):
+            return None
+        return index
+    
+    def _write_index(self, faiss, index, kind: str):
+        """Persist a freshly built index under the embedding cache key (written to a temp file, then renamed)."""
+        path = self._index_path(kind)
+        if path is None:
+            return
+        try:
+            tmp_path = path.with_suffix(".tmp")
+            faiss.write_index(index, str(tmp_path))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Could not save FAISS index: {e}")
+    
+    def _index_matches(self, query_embeddings: np.ndarray, top_k: int) -> List[List[Tuple[int, float]]]:
+        """Up to top_k (index, score) pairs per query row from the FAISS index, best first.
+        
+        Candidates from a quantized index are rescored against the float32
+        rows so the threshold always sees exact cosine scores.
+        """
+        n_candidates = max(top_k, ANN_RESCORE_CANDIDATES) if self._index_rescore else top_k
+        k = min(n_candidates, self.index.ntotal)
+        scores, ids = self.index.search(np.ascontiguousarray(query_embeddings, dtype=np.float32), k)
+        
+        results = []
+        for query_embedding, row_ids, row_scores in zip(query_embeddings, ids, scores):
+            row_ids = row_ids[row_ids >= 0]
+            if self._index_rescore:
+                row_scores = self.embeddings[row_ids] @ query_embedding
+                order = np.argsort(-row_scores)[:top_k]
+                row_ids, row_scores = row_ids[order], row_scores[order]
+            results.append([(int(idx), float(score)) for idx, score in zip(row_ids, row_scores)])
+        return results
+    
+    def _binary_candidates(self, query_embedding: np.ndarray) -> Optional[np.ndarray]:
+        """Rows closest to the query in Hamming distance, or None to scan everything."""
+        if self.emb_bin is None:
+            return None
+        
+        query_bits = np.packbits(query_embedding > 0)
+        distances = np.bitwise_count(self.emb_bin ^ query_bits).sum(axis=1)
+        k = min(BINARY_RESCORE_CANDIDATES, len(distances))
+        return np.argpartition(distances, k - 1)[:k]
+    
+    def _similarities(self, query_embedding: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cosine similarity of a normalized query vector against the stored rows.
+        
+        Args:
+            query_embedding: Unit-length query vector
+            rows: Optional subset of row indices to score (all rows if None)
+        """
+        if self.emb_q is not None:
+            emb_q = self.emb_q if rows is None else self.emb_q[rows]
+            emb_scales = self.emb_scales if rows is None else self.emb_scales[rows]
+            q_codes, q_scale = quantize_int8(query_embedding[np.newaxis, :])
+            dots = emb_q.astype(np.int32) @ q_codes[0].astype(np.int32)
+            return dots * (emb_scales[:, 0] * q_scale[0, 0])
+        
+        embeddings = self.embeddings if rows is None else self.embeddings[rows]
+        return embeddings @ query_embedding
+    
+    def _best_match(self, query_embedding: np.ndarray) -> Tuple[int, float]:
+        """Index and cosine score of the stored row closest to the query."""
+        if self.index is not None:
+            return self._index_matches(query_embedding[np.newaxis, :], 1)[0][0]
+        
+        rows = self._binary_candidates(query_embedding)
+        
+        # Full scans use the fused kernel when numba is available: no similarity array
+        kernels = _compiled_kernels() if rows is None else None
+        if kernels is not None:
+            fused_best_match, fused_best_match_int8 = kernels
+            if self.emb_q is not None:
+                q_codes, q_scale = quantize_int8(query_embedding[np.newaxis, :])
+                best_idx, score = fused_best_match_int8(np.asarray(self.emb_q), self.emb_scales[:, 0], q_codes[0])
+                return int(best_idx), float(score * q_scale[0, 0])
+            best_idx, score = fused_best_match(self.embeddings, query_embedding)
+            return int(best_idx), float(score)
+        
+        similarities = self._similarities(query_embedding, rows)
+        best = int(np.argmax(similarities))
+        best_idx = best if rows is None else int(rows[best])
+        return best_idx, float(similarities[best])
+    
+    def _top_matches(self, query_embedding: np.ndarray, top_k: int) -> List[Tuple[int, float]]:
+        """Up to top_k (index, score) pairs, best first.
+        
+        np.argpartition selects the top_k in O(N); only those k are sorted.
+        """
+        if self.index is not None:
+            return self._index_matches(query_embedding[np.newaxis, :], top_k)[0]
+        
+        rows = self._binary_candidates(query_embedding)
+        similarities = self._similarities(query_embedding, rows)
+        k = min(top_k, len(similarities))
+        top = np.argpartition(similarities, -k)[-k:]
+        top = top[np.argsort(-similarities[top])]
+        indices = top if rows is None else rows[top]
+        return [(int(idx), float(similarities[pos])) for idx, pos in zip(indices, top)]
+    
     def initialize(self):
         if not self.load_data():
             return False
@@ -177,65 +641,270 @@ class SemanticSearch:
         if not self.load_model():
             return False
         
-        # Try to load existing embeddings, otherwise generate new ones
-        if not self.load_embeddings():
-            if not self.generate_embeddings():
-                return False
+        # Reuses embeddings cached for this corpus, otherwise encodes and caches them
+        if not self.generate_embeddings():
+            return False
         
         print("Semantic search initialized successfully!")
         return True
     
-    def search(self, query, top_k=1):
-        """Search for the most relevant content based on the query."""
+    # Live or rebuildable state left out of save() snapshots
+    _UNPICKLED_STATE = (
+        'model', '_query_cache', '_response_lock',
+        '_response_vectors', '_responses', '_response_slot', 'index'
+    )
+    
+    def _source_mtimes(self) -> Dict[str, Optional[int]]:
+        """Modification times of the data files a snapshot was built from."""
+        mtimes = {}
+        for path in (self.content_file, self.csv_path):
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                mtimes[path] = None
+        return mtimes
+    
+    def __getstate__(self):
+        state = {k: v for k, v in self.__dict__.items() if k not in self._UNPICKLED_STATE}
+        for name in EMBEDDING_ARRAYS:
+            if state.get(name) is not None:
+                state[name] = np.asarray(state[name])  # plain arrays, not memmaps
+        state['_snapshot_mtimes'] = self._source_mtimes()
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.model = None
+        self.index = None
+        self._query_cache = functools.lru_cache(maxsize=QUERY_CACHE_SIZE)(self._encode_query_uncached)
+        self._response_lock = threading.Lock()
+        self._clear_response_cache()
+    
+    def save(self, path):
+        """Snapshot the initialized system (data, embeddings) to path with pickle.
+        
+        The encoder and the FAISS index are not stored; load() restores them.
+        """
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    @classmethod
+    def load(cls, path) -> "SemanticSearch":
+        """Restore a system written by save(), reloading the (cached) encoder.
+        
+        Unpickling can run arbitrary code, so path must be a location only
+        this project writes to (see EMBEDDINGS_DIR), never a shared directory.
+        
+        Raises:
+            FileNotFoundError: If there is no snapshot at path
+            ValueError: If the data files changed since the snapshot or the
+                encoder no longer matches its embeddings
+        """
+        with open(path, 'rb') as f:
+            search_system = pickle.load(f)
+        if not isinstance(search_system, cls):
+            raise ValueError(f"{path} does not hold a {cls.__name__} snapshot")
+        
+        snapshot_mtimes = search_system.__dict__.pop('_snapshot_mtimes', None)
+        if snapshot_mtimes != search_system._source_mtimes():
+            raise ValueError(f"Snapshot {path} is stale: the data files changed")
+        
+        # The constructor would have switched the global phase as well
+        if search_system.forced_phase:
+            version_manager.set_phase(search_system.forced_phase)
+        
+        snapshot_encoder = search_system.encoder_id
+        if not search_system.load_model():
+            raise ValueError("Could not load the encoder for the snapshot")
+        if search_system.encoder_id != snapshot_encoder:
+            raise ValueError(f"Snapshot {path} was embedded with a different encoder")
+        
+        # The stored codes follow the precision the snapshot was taken with;
+        # reuse them only where they still match the current settings
+        search_system._prepare_quantized(search_system.emb_q, search_system.emb_scales, search_system.emb_bin)
+        search_system._build_index()
+        return search_system
+    
+    @property
+    def threshold(self) -> float:
+        return self._threshold
+    
+    @threshold.setter
+    def threshold(self, value: float):
+        # Cached responses embed the accept/reject decision for the old threshold
+        self._threshold = value
+        self._clear_response_cache()
+    
+    def _clear_response_cache(self):
+        """Drop every cached response (new threshold, encoder or embeddings)."""
+        with self._response_lock:
+            self._response_vectors = None
+            self._responses = []
+            self._response_slot = 0
+    
+    def _cached_response(self, query_embedding: np.ndarray) -> Optional[str]:
+        """Response of an earlier top-1 query within RESPONSE_CACHE_SIMILARITY, if any."""
+        with self._response_lock:
+            if not self._responses:
+                return None
+            similarities = self._response_vectors[:len(self._responses)] @ query_embedding
+            best = int(np.argmax(similarities))
+            if similarities[best] >= RESPONSE_CACHE_SIMILARITY:
+                return self._responses[best]
+        return None
+    
+    def _remember_response(self, query_embedding: np.ndarray, response: str):
+        """Store a top-1 response, overwriting the oldest once RESPONSE_CACHE_SIZE is reached."""
+        with self._response_lock:
+            if self._response_vectors is None:
+                self._response_vectors = np.empty((RESPONSE_CACHE_SIZE, len(query_embedding)), dtype=np.float32)
+            slot = self._response_slot
+            self._response_vectors[slot] = query_embedding
+            if slot < len(self._responses):
+                self._responses[slot] = response
+            else:
+                self._responses.append(response)
+            self._response_slot = (slot + 1) % RESPONSE_CACHE_SIZE
+    
+    @staticmethod
+    def _check_top_k(top_k: int):
+        """Reject top_k values that would not select between 1 and N matches."""
+        if top_k < 1:
+            raise ValueError(f"top_k must be at least 1, got {top_k}")
+    
+    def search(self, query, top_k=1, threshold: Optional[float] = None):
+        """Search for the most relevant content based on the query.
+        
+        With top_k > 1, every one of the top_k matches that clears the
+        threshold is included in the response, best first. Top-1 responses
+        are served from the semantic response cache for near-identical queries.
+        A threshold given here applies to this call only, so callers sharing
+        one instance (e.g. UI sessions) do not overwrite each other's setting.
+        
+        Raises:
+            ValueError: If top_k is less than 1
+        """
+        self._check_top_k(top_k)
         if self.model is None or self.embeddings is None:
             return "System not initialized properly"
         
         try:
-            # Encode the query
-            query_embedding = self.model.encode([query])
-            
-            # Calculate cosine similarities
-            similarities = cosine_similarity(query_embedding, self.embeddings)[0]
-            
-            # Find the best match
-            best_idx = np.argmax(similarities)
-            best_score = similarities[best_idx]
+            # Encode the query (unit length, so the dot product is the cosine)
+            query_embedding = self._encode_query(query)
             
-            if best_score >= self.threshold:
-                if self.use_content_mode and self.content_chunks:
-                    # Return content from chunks
-                    best_chunk = self.content_chunks[best_idx]
-                    answer = best_chunk['content']
-                    context = best_chunk.get('context', '')
-                    content_type = best_chunk.get('type', 'general')
-                    
-                    # Format response with context
-                    response = f"{answer}"
-                    if context and context != "General Information":
-                        response += f"\n\n*Source: {context}*"
-                    
-                    confidence = f"\n(Confidence: {best_score:.2f}, Type: {content_type})"
-                    return f"{response} {confidence}"
-                    
-                elif self.df is not None:
-                    # Fallback to CSV mode
-                    answer = self.df.iloc[best_idx]['Answer']
-                    confidence = f"(Confidence: {best_score:.2f})"
-                    return f"{answer} {confidence}"
-                else:
-                    return "No content available for response"
-            else:
-                return f"I'm sorry, I don't have enough information to answer that question. (Best match confidence: {best_score:.2f})"
+            # Find the best match(es) against the pre-normalized corpus; the
+            # response cache only holds answers for the instance threshold
+            if threshold is None or threshold == self.threshold:
+                threshold = None
+                if top_k == 1:
+                    response = self._cached_response(query_embedding)
+                    if response is None:
+                        response = self._format_response([self._best_match(query_embedding)])
+                        self._remember_response(query_embedding, response)
+                    return response
+            if top_k == 1:
+                return self._format_response([self._best_match(query_embedding)], threshold)
+            return self._format_response(self._top_matches(query_embedding, top_k), threshold)
                 
         except Exception as e:
-            return f"Error processing query: {e}"
+            return f"{self.ERROR}: {e}"
+    
+    def search_batch(self, queries: List[str], top_k: int = 1) -> List[str]:
+        """Search many queries at once; returns one response per query, in order.
+        
+        All queries are encoded in a single batched forward pass. With an HNSW
+        index the whole batch is one index search; for top_k=1 over a plain
+        float32 corpus the scores come from a single (Q, D) x (D, N) matrix
+        product; other configurations score each encoded query in turn.
+        Top-1 queries answered by the semantic response cache are not rescored.
+        
+        Raises:
+            ValueError: If top_k is less than 1
+        """
+        self._check_top_k(top_k)
+        if self.model is None or self.embeddings is None:
+            return ["System not initialized properly"] * len(queries)
+        if not queries:
+            return []
+        
+        try:
+            query_embeddings = self._encode_queries(queries)
+            if top_k != 1:
+                return self._search_encoded(query_embeddings, top_k)
+            
+            # Only the queries the response cache cannot answer are scored
+            responses = [self._cached_response(query_embedding) for query_embedding in query_embeddings]
+            misses = [i for i, response in enumerate(responses) if response is None]
+            if misses:
+                for i, response in zip(misses, self._search_encoded(query_embeddings[misses], top_k)):
+                    responses[i] = response
+                    self._remember_response(query_embeddings[i], response)
+            return responses
+        
+        except Exception as e:
+            return [f"{self.ERROR}: {e}"] * len(queries)
+    
+    def _search_encoded(self, query_embeddings: np.ndarray, top_k: int) -> List[str]:
+        """Responses for a (Q, D) block of encoded queries."""
+        if self.index is not None:
+            return [self._format_response(matches) for matches in self._index_matches(query_embeddings, top_k)]
+        
+        if top_k == 1 and self.emb_q is None and self.emb_bin is None:
+            similarities = query_embeddings @ self.embeddings.T
+            best = np.argmax(similarities, axis=1)
+            scores = similarities[np.arange(len(best)), best]
+            return [self._format_response([(int(idx), float(score))]) for idx, score in zip(best, scores)]
+        
+        responses = []
+        for query_embedding in query_embeddings:
+            if top_k == 1:
+                matches = [self._best_match(query_embedding)]
+            else:
+                matches = self._top_matches(query_embedding, top_k)
+            responses.append(self._format_response(matches))
+        return responses
+    
+    def _format_response(self, matches: List[Tuple[int, float]], threshold: Optional[float] = None) -> str:
+        """Join the matches that clear the threshold (self.threshold by default), or explain that none did."""
+        if threshold is None:
+            threshold = self.threshold
+        best_score = matches[0][1]
+        if best_score >= threshold:
+            return "\n\n---\n\n".join(
+                self._format_match(idx, score) for idx, score in matches if score >= threshold
+            )
+        return f"{self.NO_INFO} (Best match confidence: {best_score:.2f})"
+    
+    def _format_match(self, idx: int, score: float) -> str:
+        """Format the stored row at idx as a response with its confidence."""
+        if self.use_content_mode and self.content_chunks:
+            # Return content from chunks
+            answer = self.content_chunks.content[idx]
+            context = self.content_chunks.context[idx]
+            content_type = self.content_chunks.type[idx]
+            
+            # Format response with context
+            response = f"{answer}"
+            if context and context != "General Information":
+                response += f"\n\n*Source: {context}*"
+            
+            confidence = f"\n(Confidence: {score:.2f}, Type: {content_type})"
+            return f"{response} {confidence}"
+            
+        elif self.answers is not None:
+            # Fallback to CSV mode
+            answer = self.answers[idx]
+            confidence = f"(Confidence: {score:.2f})"
+            return f"{answer} {confidence}"
+        else:
+            return "No content available for response"
     
     def get_stats(self):
         """Get statistics about the current knowledge base."""
         stats = []
         
         # Add version information
-        version_info = version_manager.get_version_info()
+        version_info = self.get_version_info()
         stats.append(f"Mode: {version_info['current_phase'].replace('_', ' ').title()}")
         
         if self.use_content_mode and self.content_chunks:
@@ -256,5 +925,5 @@ class SemanticSearch:
         return "Knowledge base - " + "; ".join(stats) if stats else "No data loaded"
     
     def get_version_info(self):
-        """Get current version and phase information."""
-        return version_manager.get_version_info()
\ No newline at end of file
+        """Get version and phase information (this instance's forced phase, if any)."""
+        return version_manager.get_version_info(self.forced_phase)
\ No newline at end of file
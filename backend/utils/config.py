@@ -8,13 +8,62 @@ EMBEDDINGS_DIR = DATA_DIR / "embeddings"
 
 # Data files
 QA_CSV_PATH = DATA_DIR / "qa.csv"
-EMBEDDINGS_PATH = EMBEDDINGS_DIR / "embeddings.pkl"
+# Embeddings are cached in EMBEDDINGS_DIR as <key>.npy (+ <key>.meta.json), where
+# the key hashes the encoder, the mode and the embedded texts; FAISS indexes for
+# large corpora are saved under the same key as <key>.<kind>.faiss
 
 # Model configuration
 DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 DEFAULT_THRESHOLD = 0.5  # Lowered threshold for better content matching
 EMBEDDING_DIMENSION = 384
 
+# Encoder backend: "onnx" loads the pre-quantized ONNX export shipped with the
+# model (needs the onnx extra) and falls back to "torch" when unavailable
+ENCODER_BACKEND = "onnx"
+ONNX_MODEL_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+# Dynamically quantize the PyTorch encoder's Linear layers to int8 on CPU
+QUANTIZE_ENCODER = True
+
+# Number of distinct query embeddings kept in memory for repeated questions
+QUERY_CACHE_SIZE = 1024
+
+# Semantic response cache: a top-1 answer is reused for any later query whose
+# embedding has at least this cosine similarity to an answered one
+RESPONSE_CACHE_SIMILARITY = 0.95
+RESPONSE_CACHE_SIZE = 256
+
+# Corpus encoding: batch size, and a token cap well above the ~100 tokens
+# of a max-size content chunk so long inputs cannot inflate padding
+EMBEDDING_BATCH_SIZE = 64
+MAX_SEQ_LENGTH = 256
+
+# Storage precision used for similarity scoring: "float32", "float16" or "int8"
+# (int8 keeps one fp32 scale per row and quarters the bytes scanned per query;
+# float16 halves the FAISS HNSW index while exact scans stay float32)
+EMBEDDING_PRECISION = "float32"
+
+# Corpora at least this large are prefiltered by Hamming distance on
+# sign-binarized embeddings; only the closest candidates are rescored exactly
+BINARY_PREFILTER_MIN_SIZE = 10000
+BINARY_RESCORE_CANDIDATES = 100
+
+# Corpora at least this large are searched through a FAISS HNSW graph when
+# faiss is installed; below it an exact scan is cheaper than graph traversal
+ANN_INDEX_MIN_SIZE = 1000
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 100
+HNSW_EF_SEARCH = 64
+
+# Above this many rows the FAISS index is IVF-PQ instead: sqrt(N)*2 inverted
+# lists, a tenth of them probed per query, and 16 one-byte PQ codes per vector.
+# Quantized indexes (IVF-PQ, HNSW-SQ8) return ANN_RESCORE_CANDIDATES rows per
+# query, which are rescored exactly against the float32 embeddings
+IVFPQ_MIN_SIZE = 10000
+IVFPQ_M = 16
+IVFPQ_NBITS = 8
+ANN_RESCORE_CANDIDATES = 100
+
 # Content processing configuration
 CONTENT_FILE_PATH = DATA_DIR / "content.txt"
 
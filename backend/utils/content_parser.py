@@ -1,7 +1,10 @@
 import re
+from collections import Counter
 from typing import List, Dict, Tuple
 from pathlib import Path
 
+from ..models.qa_model import ContentChunks
+
 class ContentParser:
     """
     Parser to extract meaningful chunks from plain text content.
@@ -12,7 +15,36 @@ class ContentParser:
         self.min_chunk_size = min_chunk_size
         self.max_chunk_size = max_chunk_size
         
-    def parse_file(self, file_path: str) -> List[Dict[str, str]]:
+        # Patterns are compiled once per parser rather than looked up on every call
+        self._line_num_re = re.compile(r'^\s*\d+→', re.MULTILINE)
+        self._chapter_re = re.compile(r'Chapter\s+[IVX]+\s+([^.]+)', re.IGNORECASE)
+        self._sentence_split_re = re.compile(r'(?<=[.!?])\s+')
+        self._para_split_re = re.compile(r'\n\s*\n|\. \s*(?=[A-Z])')
+        
+        # Keyword lists become one alternation each, scanned in a single regex pass
+        title_indicators = [
+            'About', 'What is', 'How to', 'Documents', 'Required', 
+            'Registration', 'Process', 'Obligations', 'Vision', 'Mission',
+            'EJARI', 'Mechanisms', 'Training', 'Users', 'Companies'
+        ]
+        self._title_indicator_re = self._keyword_re(title_indicators)
+        
+        # Checked in order; the first content type whose keywords match wins.
+        # Case-insensitive matching spares a lowercased copy of every chunk.
+        self._type_patterns = [
+            ('requirements', self._keyword_re(['required documents', 'copy of', 'passport', 'license'], re.IGNORECASE)),
+            ('procedure', self._keyword_re(['step', 'process', 'procedure', 'how to'], re.IGNORECASE)),
+            ('definition', self._keyword_re(['definition', 'means', 'refers to', 'is defined as'], re.IGNORECASE)),
+            ('pricing', self._keyword_re(['percentage', 'rate', 'fee', 'amount', 'aed'], re.IGNORECASE)),
+            ('legal', self._keyword_re(['law', 'article', 'decree', 'regulation'], re.IGNORECASE))
+        ]
+    
+    @staticmethod
+    def _keyword_re(keywords: List[str], flags: int = 0) -> re.Pattern:
+        """Compile a pattern matching any of the keywords as a plain substring."""
+        return re.compile('|'.join(map(re.escape, keywords)), flags)
+        
+    def parse_file(self, file_path: str) -> ContentChunks:
         """
         Parse a text file and extract meaningful content chunks.
         
@@ -20,7 +52,7 @@ class ContentParser:
             file_path: Path to the text file
             
         Returns:
-            List of dictionaries containing parsed content chunks
+            ContentChunks holding the parsed chunks column-wise
         """
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
@@ -30,9 +62,9 @@ class ContentParser:
             
         except Exception as e:
             print(f"Error reading file {file_path}: {e}")
-            return []
+            return ContentChunks()
     
-    def parse_content(self, content: str) -> List[Dict[str, str]]:
+    def parse_content(self, content: str) -> ContentChunks:
         """
         Parse raw content and extract structured chunks.
         
@@ -40,9 +72,9 @@ class ContentParser:
             content: Raw text content
             
         Returns:
-            List of content chunks with metadata
+            ContentChunks with content, context and type columns
         """
-        chunks = []
+        chunks = ContentChunks()
         
         # Clean and normalize content
         content = self._clean_content(content)
@@ -59,27 +91,16 @@ class ContentParser:
     
     def _clean_content(self, content: str) -> str:
         """Clean and normalize the raw content."""
-        # Remove line numbers at the start of lines
-        content = re.sub(r'^\s*\d+→', '', content, flags=re.MULTILINE)
-        
-        # Normalize whitespace
-        content = re.sub(r'\s+', ' ', content)
-        
-        # Remove excessive spaces
-        content = re.sub(r' +', ' ', content)
-        
-        return content.strip()
+        # Remove line numbers at the start of lines, then normalize whitespace:
+        # str.split() collapses whitespace runs and drops the ends in one pass
+        return ' '.join(self._line_num_re.sub('', content).split())
     
     def _extract_sections(self, content: str) -> List[Tuple[str, str]]:
         """Extract sections from the content based on structure."""
         sections = []
         
-        # Define section patterns
-        chapter_pattern = r'Chapter\s+[IVX]+\s+([^.]+)'
-        heading_pattern = r'([A-Z][^.!?]*(?:Program|Guide|Mechanisms|Training|Registration|Documents|Obligations|Provisions|Index))\s*\n'
-        
         # Find chapters
-        chapters = re.finditer(chapter_pattern, content, re.IGNORECASE)
+        chapters = self._chapter_re.finditer(content)
         chapter_positions = [(m.start(), m.group(1).strip(), m.group(0)) for m in chapters]
         
         # Process content by chapters or major sections
@@ -99,7 +120,7 @@ class ContentParser:
         sections = []
         
         # Split by double newlines or major breaks
-        paragraphs = re.split(r'\n\s*\n|\. \s*(?=[A-Z])', content)
+        paragraphs = self._para_split_re.split(content)
         
         current_section = ""
         section_title = "General Information"
@@ -130,86 +151,54 @@ class ContentParser:
     def _is_section_title(self, text: str) -> bool:
         """Determine if text looks like a section title."""
         # Check for common title patterns
-        title_indicators = [
-            'About', 'What is', 'How to', 'Documents', 'Required', 
-            'Registration', 'Process', 'Obligations', 'Vision', 'Mission',
-            'EJARI', 'Mechanisms', 'Training', 'Users', 'Companies'
-        ]
-        
         return (len(text) < 100 and 
-                any(indicator in text for indicator in title_indicators) and
+                self._title_indicator_re.search(text) is not None and
                 not text.endswith('.'))
     
-    def _create_chunks(self, content: str, section_title: str) -> List[Dict[str, str]]:
+    def _create_chunks(self, content: str, section_title: str) -> ContentChunks:
         """Create appropriately sized chunks from section content."""
-        chunks = []
+        chunks = ContentChunks()
         
         # If content is small enough, return as single chunk
         if len(content) <= self.max_chunk_size:
             if len(content) >= self.min_chunk_size:
-                chunks.append({
-                    'content': content.strip(),
-                    'context': section_title,
-                    'type': self._determine_content_type(content)
-                })
+                chunks.append(content.strip(), section_title, self._determine_content_type(content))
             return chunks
         
         # Split longer content into smaller chunks
-        sentences = re.split(r'(?<=[.!?])\s+', content)
+        sentences = self._sentence_split_re.split(content)
         current_chunk = ""
         
         for sentence in sentences:
             # If adding this sentence would exceed max size, save current chunk
             if len(current_chunk + sentence) > self.max_chunk_size and len(current_chunk) >= self.min_chunk_size:
-                chunks.append({
-                    'content': current_chunk.strip(),
-                    'context': section_title,
-                    'type': self._determine_content_type(current_chunk)
-                })
+                chunks.append(current_chunk.strip(), section_title, self._determine_content_type(current_chunk))
                 current_chunk = sentence
             else:
                 current_chunk += " " + sentence if current_chunk else sentence
         
         # Add remaining content as final chunk
         if len(current_chunk.strip()) >= self.min_chunk_size:
-            chunks.append({
-                'content': current_chunk.strip(),
-                'context': section_title,
-                'type': self._determine_content_type(current_chunk)
-            })
+            chunks.append(current_chunk.strip(), section_title, self._determine_content_type(current_chunk))
         
         return chunks
     
     def _determine_content_type(self, content: str) -> str:
         """Determine the type of content for better categorization."""
-        content_lower = content.lower()
-        
-        if any(word in content_lower for word in ['required documents', 'copy of', 'passport', 'license']):
-            return 'requirements'
-        elif any(word in content_lower for word in ['step', 'process', 'procedure', 'how to']):
-            return 'procedure'
-        elif any(word in content_lower for word in ['definition', 'means', 'refers to', 'is defined as']):
-            return 'definition'
-        elif any(word in content_lower for word in ['percentage', 'rate', 'fee', 'amount', 'aed']):
-            return 'pricing'
-        elif any(word in content_lower for word in ['law', 'article', 'decree', 'regulation']):
-            return 'legal'
-        else:
-            return 'general'
+        for content_type, pattern in self._type_patterns:
+            if pattern.search(content):
+                return content_type
+        return 'general'
 
-    def get_stats(self, chunks: List[Dict[str, str]]) -> Dict[str, int]:
+    def get_stats(self, chunks: ContentChunks) -> Dict[str, int]:
         """Get statistics about the parsed chunks."""
         if not chunks:
             return {}
         
         stats = {
             'total_chunks': len(chunks),
-            'avg_chunk_size': sum(len(chunk['content']) for chunk in chunks) // len(chunks),
-            'types': {}
+            'avg_chunk_size': sum(map(len, chunks.content)) // len(chunks),
+            'types': dict(Counter(chunks.type))
         }
         
-        for chunk in chunks:
-            chunk_type = chunk['type']
-            stats['types'][chunk_type] = stats['types'].get(chunk_type, 0) + 1
-        
         return stats
\ No newline at end of file
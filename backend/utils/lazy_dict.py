@@ -0,0 +1,61 @@
+"""
+Lazy Mapping Utility
+Read-only mapping whose values are built on first access and then cached.
+"""
+
+from collections.abc import Mapping
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LazyDict(Mapping):
+    """
+    Mapping of key -> builder callable that materializes each value on demand.
+
+    Keys must expose a small non-negative integer ``index`` (see the phase and
+    release enums); values live in a list slot per index, so a lookup is an
+    attribute read plus a list index instead of an Enum hash and dict probe.
+    Each slot also records its key, and a lookup must hit that exact key, so
+    a member of another enum with the same index is not an alias for it.
+    Keys, membership and len() only consult the builders, so iterating keys
+    never constructs a value; items()/values() build whatever they touch.
+    """
+
+    def __init__(self, builders: Dict[K, Callable[[], V]]):
+        self._keys = tuple(builders)
+        size = max((key.index for key in self._keys), default=-1) + 1
+        self._builders: List[Optional[Callable[[], V]]] = [None] * size
+        self._keys_by_slot: List[Optional[K]] = [None] * size
+        for key, builder in builders.items():
+            self._builders[key.index] = builder
+            self._keys_by_slot[key.index] = key
+        self._values: List[Optional[V]] = [None] * size
+
+    def _slot(self, key: object) -> int:
+        index = getattr(key, "index", None)
+        if isinstance(index, int) and 0 <= index < len(self._builders) \
+                and self._keys_by_slot[index] is key:
+            return index
+        raise KeyError(key)
+
+    def __getitem__(self, key: K) -> V:
+        index = self._slot(key)
+        value = self._values[index]
+        if value is None:
+            value = self._values[index] = self._builders[index]()
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self._slot(key)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
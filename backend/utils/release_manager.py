@@ -6,30 +6,97 @@ Follows development guidelines for consistent release management.
 
 from enum import Enum
 from dataclasses import dataclass
-from typing import Dict, Any, List, Optional
+from types import MappingProxyType
+from typing import Callable, Dict, Any, List, Mapping, Optional, Tuple
+import functools
 import json
+import os
 from pathlib import Path
 
+from .lazy_dict import LazyDict
+
 class ReleaseVersion(Enum):
-    """Available system releases."""
-    PHASE_1 = "phase_1"
-    PHASE_2 = "phase_2" 
-    PHASE_3 = "phase_3"  # Future release
-    LATEST = "latest"    # Auto-detect latest
+    """Available system releases; ``index`` is a dense slot for table lookups."""
+    PHASE_1 = ("phase_1", 0)
+    PHASE_2 = ("phase_2", 1)
+    PHASE_3 = ("phase_3", 2)  # Future release
+    LATEST = ("latest", 3)    # Auto-detect latest
+    
+    def __new__(cls, value: str, index: int):
+        member = object.__new__(cls)
+        member._value_ = value
+        member.index = index
+        return member
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ReleaseConfig:
-    """Configuration for a specific release."""
+    """Configuration for a specific release (immutable; shared by all callers)."""
     version: str
     name: str
     description: str
-    features: List[str]
+    features: Tuple[str, ...]
     technical_doc: str
-    test_commands: List[str]
-    demo_queries: List[str]
-    performance_metrics: Dict[str, Any]
+    test_commands: Tuple[str, ...]
+    demo_queries: Tuple[str, ...]
+    performance_metrics: Mapping[str, Any]  # read-only MappingProxyType
     backward_compatible: bool
 
+# Body of the generated per-release test script, filled in with str.format_map;
+# doubled braces are literal braces in the generated code
+_TEST_SCRIPT_TEMPLATE = '''#!/usr/bin/env python3
+"""
+Local test script for {release_name}
+Generated by ReleaseManager - Not committed to git
+"""
+
+def test_{release_value}():
+    """Test {release_name}."""
+    print("=" * 60)
+    print(f"TESTING {release_name_upper}")
+    print("=" * 60)
+    
+    from backend.services.semantic_search import SemanticSearch
+    from backend.utils.version_manager import SystemPhase
+    
+    # Initialize system for this release
+    search_system = SemanticSearch(force_phase=SystemPhase.{release_member})
+    
+    if not search_system.initialize():
+        print(f"❌ Failed to initialize {release_value}")
+        return False
+        
+    print(f"✅ System initialized")
+    print(f"📊 Stats: {{search_system.get_stats()}}")
+    print()
+    
+    # Test demo queries
+    demo_queries = {demo_queries!r}
+    successful_responses = 0
+    
+    for i, query in enumerate(demo_queries, 1):
+        print(f"{{i}}. Query: '{{query}}'")
+        response = search_system.search(query)
+        
+        if SemanticSearch.is_answer(response):
+            successful_responses += 1
+            print(f"✅ SUCCESS")
+        else:
+            print(f"❌ FAILED")
+        print()
+    
+    success_rate = (successful_responses / len(demo_queries)) * 100
+    expected_rate = {expected_rate!r}
+    
+    print(f"📈 Results: {{successful_responses}}/{{len(demo_queries)}} queries ({{success_rate:.1f}}%)")
+    print(f"📊 Expected: {{expected_rate:.1f}}%")
+    
+    return success_rate >= expected_rate * 0.8  # Allow 20% variance
+
+if __name__ == "__main__":
+    success = test_{release_value}()
+    print(f"\\n{{'✅ PASS' if success else '❌ FAIL'}}: {release_name}")
+'''
+
 class ReleaseManager:
     """
     Manages different system releases according to development guidelines.
@@ -44,45 +111,50 @@ class ReleaseManager:
     
     def __init__(self):
         self.current_release = ReleaseVersion.LATEST
-        self.release_configs = self._initialize_release_configs()
+        # Each ReleaseConfig is built on first access rather than at import time
+        self._config_builders = self._initialize_release_configs()
+        self.release_configs = LazyDict(self._config_builders)
+        self._detected_release: Optional[ReleaseVersion] = None  # memoized filesystem probe
+        self._execution_steps: Dict[ReleaseVersion, Dict[str, Tuple[str, ...]]] = {}  # per release
+        self._test_scripts: Dict[ReleaseVersion, str] = {}  # per release
         
-    def _initialize_release_configs(self) -> Dict[ReleaseVersion, ReleaseConfig]:
-        """Initialize configuration for each release following guidelines."""
+    def _initialize_release_configs(self) -> Dict[ReleaseVersion, Callable[[], ReleaseConfig]]:
+        """Register a configuration builder for each release following guidelines."""
         return {
-            ReleaseVersion.PHASE_1: ReleaseConfig(
+            ReleaseVersion.PHASE_1: lambda: ReleaseConfig(
                 version="1.0.0",
                 name="Phase 1: CSV-based Q&A System",
                 description="Basic semantic search with predefined Q&A pairs",
-                features=[
+                features=(
                     "CSV-based knowledge storage",
                     "Basic semantic search",
                     "Confidence scoring",
                     "Simple Q&A matching"
-                ],
+                ),
                 technical_doc="PHASE1_TECHNICAL.md",
-                test_commands=[
+                test_commands=(
                     "uv run python -c \"from backend.services.semantic_search import SemanticSearch; from backend.utils.version_manager import SystemPhase; s=SemanticSearch(force_phase=SystemPhase.PHASE_1); s.initialize(); print(s.get_stats())\"",
                     "uv run python test_backend.py"
-                ],
-                demo_queries=[
+                ),
+                demo_queries=(
                     "What is EJARI?",
                     "How do I register my tenancy contract?",
                     "What documents are required?"
-                ],
-                performance_metrics={
+                ),
+                performance_metrics=MappingProxyType({
                     "knowledge_base_size": 8,
                     "success_rate": 0.4,
                     "response_type": "basic",
                     "threshold": 0.7
-                },
+                }),
                 backward_compatible=True
             ),
             
-            ReleaseVersion.PHASE_2: ReleaseConfig(
+            ReleaseVersion.PHASE_2: lambda: ReleaseConfig(
                 version="2.0.0", 
                 name="Phase 2: Content-based Knowledge System",
                 description="Intelligent document processing with content chunking",
-                features=[
+                features=(
                     "Intelligent content parsing",
                     "Automatic document chunking", 
                     "Content categorization",
@@ -90,14 +162,14 @@ class ReleaseManager:
                     "Source attribution",
                     "Enhanced similarity matching",
                     "Direct embedding storage"
-                ],
+                ),
                 technical_doc="PHASE2_TECHNICAL.md",
-                test_commands=[
+                test_commands=(
                     "uv run python test_final_system.py",
                     "uv run python test_enhanced_system.py",
                     "uv run python demo_comparison.py"
-                ],
-                demo_queries=[
+                ),
+                demo_queries=(
                     "What is EJARI?",
                     "How do I register a tenancy contract with EJARI?",
                     "What are the rent increase percentages in Dubai?", 
@@ -105,15 +177,15 @@ class ReleaseManager:
                     "What are landlord obligations?",
                     "Training requirements for EJARI",
                     "Property management companies requirements"
-                ],
-                performance_metrics={
+                ),
+                performance_metrics=MappingProxyType({
                     "knowledge_base_size": 178,
                     "success_rate": 0.9,
                     "response_type": "contextual",
                     "threshold": 0.5,
                     "content_types": 6,
                     "improvement_factor": 22
-                },
+                }),
                 backward_compatible=True
             )
         }
@@ -121,110 +193,96 @@ class ReleaseManager:
     def get_release_info(self, release: Optional[ReleaseVersion] = None) -> ReleaseConfig:
         """Get configuration for a specific release."""
         target_release = release or self._detect_latest_release()
-        return self.release_configs.get(target_release, self.release_configs[ReleaseVersion.PHASE_1])
+        if target_release not in self.release_configs:
+            target_release = ReleaseVersion.PHASE_1
+        return self.release_configs[target_release]
+    
+    def invalidate_cache(self):
+        """Forget memoized detection results, execution steps, test scripts and the demonstration plan, e.g. after data files change."""
+        self._detected_release = None
+        self._execution_steps.clear()
+        self._test_scripts.clear()
+        self.__dict__.pop("demonstration_plan", None)
     
     def _detect_latest_release(self) -> ReleaseVersion:
-        """Detect the latest available release based on implementation."""
-        # Check for Phase 2 capabilities
-        content_file = Path("data/content.txt")
-        if content_file.exists() and content_file.stat().st_size > 1000:
-            return ReleaseVersion.PHASE_2
+        """Detect the latest available release based on implementation (memoized)."""
+        if self._detected_release is None:
+            self._detected_release = self._probe_latest_release()
+        return self._detected_release
+    
+    def _probe_latest_release(self) -> ReleaseVersion:
+        """Inspect the data files to find the latest implemented release."""
+        # Check for Phase 2 capabilities with a single stat call
+        try:
+            if os.stat("data/content.txt").st_size > 1000:
+                return ReleaseVersion.PHASE_2
+        except FileNotFoundError:
+            pass
         
         # Default to Phase 1
         return ReleaseVersion.PHASE_1
     
-    def get_execution_steps(self, release: ReleaseVersion) -> Dict[str, List[str]]:
-        """Get execution steps for demonstrating a specific release."""
+    def get_execution_steps(self, release: ReleaseVersion) -> Dict[str, Tuple[str, ...]]:
+        """
+        Get execution steps for demonstrating a specific release.
+        Memoized per release; each caller gets its own dict over the shared step tuples.
+        """
+        steps = self._execution_steps.get(release)
+        if steps is None:
+            steps = self._execution_steps[release] = self._build_execution_steps(release)
+        return dict(steps)
+    
+    def _build_execution_steps(self, release: ReleaseVersion) -> Dict[str, Tuple[str, ...]]:
+        """Build the execution steps for a release from its config."""
         config = self.get_release_info(release)
         
         return {
-            "environment_setup": [
+            "environment_setup": (
                 "cd /Users/himansu.panigrahy/Documents/Personal_Projects/Chatbots/chatbot-QA",
                 "# UV environment (consistent across releases)",
                 "uv --version  # Verify UV installation"
-            ],
+            ),
             "testing": config.test_commands,
-            "demonstration": [
+            "demonstration": (
                 f"# Demo {config.name}",
                 "uv run streamlit run main.py",
                 "# Test with demo queries:",
-                *[f"# - {query}" for query in config.demo_queries[:3]]
-            ],
-            "validation": [
+                *(f"# - {query}" for query in config.demo_queries[:3])
+            ),
+            "validation": (
                 f"# Expected: {config.performance_metrics.get('success_rate', 'N/A')} success rate",
                 f"# Knowledge base: {config.performance_metrics.get('knowledge_base_size', 'N/A')} items"
-            ]
+            )
         }
     
     def generate_local_test_script(self, release: ReleaseVersion) -> str:
-        """Generate local test script for a release (not committed to git)."""
-        config = self.get_release_info(release)
-        
-        script_content = f'''#!/usr/bin/env python3
-"""
-Local test script for {config.name}
-Generated by ReleaseManager - Not committed to git
-"""
-
-import sys
-from pathlib import Path
-
-# Add backend to path
-backend_path = Path(__file__).parent / "backend"
-sys.path.append(str(backend_path))
-
-def test_{release.value}():
-    """Test {config.name}."""
-    print("=" * 60)
-    print(f"TESTING {config.name.upper()}")
-    print("=" * 60)
-    
-    from services.semantic_search import SemanticSearch
-    from utils.version_manager import SystemPhase
-    
-    # Initialize system for this release
-    search_system = SemanticSearch(force_phase=SystemPhase.{release.name})
-    
-    if not search_system.initialize():
-        print(f"❌ Failed to initialize {release.value}")
-        return False
-        
-    print(f"✅ System initialized")
-    print(f"📊 Stats: {{search_system.get_stats()}}")
-    print()
-    
-    # Test demo queries
-    demo_queries = {config.demo_queries}
-    successful_responses = 0
+        """Generate local test script for a release (not committed to git, memoized per release)."""
+        script = self._test_scripts.get(release)
+        if script is None:
+            script = self._test_scripts[release] = self._build_test_script(release)
+        return script
     
-    for i, query in enumerate(demo_queries, 1):
-        print(f"{{i}}. Query: '{{query}}'")
-        response = search_system.search(query)
-        
-        if "I'm sorry, I don't have enough information" not in response:
-            successful_responses += 1
-            print(f"✅ SUCCESS")
-        else:
-            print(f"❌ FAILED")
-        print()
-    
-    success_rate = (successful_responses / len(demo_queries)) * 100
-    expected_rate = {config.performance_metrics.get('success_rate', 0) * 100}
-    
-    print(f"📈 Results: {{successful_responses}}/{{len(demo_queries)}} queries ({{success_rate:.1f}}%)")
-    print(f"📊 Expected: {{expected_rate:.1f}}%")
-    
-    return success_rate >= expected_rate * 0.8  # Allow 20% variance
-
-if __name__ == "__main__":
-    success = test_{release.value}()
-    print(f"\\n{'✅ PASS' if success else '❌ FAIL'}: {config.name}")
-'''
+    def _build_test_script(self, release: ReleaseVersion) -> str:
+        """Render the local test script template for a release."""
+        config = self.get_release_info(release)
         
-        return script_content
+        params = {
+            "release_value": release.value,
+            "release_member": release.name,
+            "release_name": config.name,
+            "release_name_upper": config.name.upper(),
+            "demo_queries": config.demo_queries,
+            "expected_rate": config.performance_metrics.get('success_rate', 0) * 100,
+        }
+        return _TEST_SCRIPT_TEMPLATE.format_map(params)
     
     def get_demonstration_plan(self) -> Dict[str, Any]:
         """Get comprehensive demonstration plan for all releases."""
+        return self.demonstration_plan
+    
+    @functools.cached_property
+    def demonstration_plan(self) -> Dict[str, Any]:
+        """Demonstration plan built once from the static release configs; treat as read-only."""
         plan = {
             "overview": "Demonstration plan following development guidelines",
             "environment": {
@@ -235,8 +293,9 @@ if __name__ == "__main__":
             "releases": {}
         }
         
-        for release, config in self.release_configs.items():
+        for release in self.release_configs:
             if release in [ReleaseVersion.PHASE_1, ReleaseVersion.PHASE_2]:  # Only implemented releases
+                config = self.release_configs[release]
                 plan["releases"][release.value] = {
                     "name": config.name,
                     "version": config.version,
@@ -257,15 +316,17 @@ if __name__ == "__main__":
             "improvements": {}
         }
         
-        for release in releases:
-            config = self.get_release_info(release)
+        # Look each release up once; the improvements below reuse these configs
+        configs = {release: self.get_release_info(release) for release in releases}
+        
+        for release, config in configs.items():
             comparison["metrics"][release.value] = config.performance_metrics
             comparison["features"][release.value] = config.features
         
         # Calculate improvements if comparing Phase 1 and Phase 2
-        if ReleaseVersion.PHASE_1 in releases and ReleaseVersion.PHASE_2 in releases:
-            phase1_metrics = self.get_release_info(ReleaseVersion.PHASE_1).performance_metrics
-            phase2_metrics = self.get_release_info(ReleaseVersion.PHASE_2).performance_metrics
+        if ReleaseVersion.PHASE_1 in configs and ReleaseVersion.PHASE_2 in configs:
+            phase1_metrics = configs[ReleaseVersion.PHASE_1].performance_metrics
+            phase2_metrics = configs[ReleaseVersion.PHASE_2].performance_metrics
             
             comparison["improvements"] = {
                 "knowledge_base_expansion": f"{phase2_metrics['knowledge_base_size'] / phase1_metrics['knowledge_base_size']:.1f}x",
@@ -275,5 +336,9 @@ if __name__ == "__main__":
         
         return comparison
 
-# Global instance following singleton pattern
-release_manager = ReleaseManager()
\ No newline at end of file
+# Global instance following singleton pattern, created on first access (PEP 562)
+def __getattr__(name: str):
+    if name == "release_manager":
+        instance = globals()[name] = ReleaseManager()
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
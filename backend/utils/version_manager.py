@@ -5,25 +5,32 @@ Enables switching between different system phases/modes for showcasing improveme
 
 from enum import Enum
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional, Tuple
 import os
-from pathlib import Path
+
+from .lazy_dict import LazyDict
 
 class SystemPhase(Enum):
-    """Enumeration of available system phases."""
-    PHASE_1 = "phase_1"  # CSV-based Q&A system
-    PHASE_2 = "phase_2"  # Content-based knowledge system
-    PHASE_3 = "phase_3"  # Future: Multi-document processing
-    AUTO = "auto"        # Automatic mode detection
+    """Enumeration of available system phases; ``index`` is a dense slot for table lookups."""
+    PHASE_1 = ("phase_1", 0)  # CSV-based Q&A system
+    PHASE_2 = ("phase_2", 1)  # Content-based knowledge system
+    PHASE_3 = ("phase_3", 2)  # Future: Multi-document processing
+    AUTO = ("auto", 3)        # Automatic mode detection
+    
+    def __new__(cls, value: str, index: int):
+        member = object.__new__(cls)
+        member._value_ = value
+        member.index = index
+        return member
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PhaseConfig:
-    """Configuration for a specific system phase."""
+    """Configuration for a specific system phase (immutable; shared by all callers)."""
     name: str
     description: str
     data_source: str
     threshold: float
-    features: list
+    features: Tuple[str, ...]
     storage_format: str
     embedding_mode: str
 
@@ -35,54 +42,61 @@ class VersionManager:
     
     def __init__(self):
         self.current_phase = SystemPhase.AUTO
-        self.phase_configs = self._initialize_phase_configs()
+        # Each PhaseConfig is built on first access rather than at import time
+        self._config_builders = self._initialize_phase_configs()
+        self.phase_configs = LazyDict(self._config_builders)
         
-    def _initialize_phase_configs(self) -> Dict[SystemPhase, PhaseConfig]:
-        """Initialize configuration for each system phase."""
+        # Memoized filesystem probes; see invalidate_cache()
+        self._data_file_sizes: Optional[Dict[str, Optional[int]]] = None
+        self._detected_phase: Optional[SystemPhase] = None
+        self._availability: Optional[Dict[SystemPhase, bool]] = None
+        
+    def _initialize_phase_configs(self) -> Dict[SystemPhase, Callable[[], PhaseConfig]]:
+        """Register a configuration builder for each system phase."""
         return {
-            SystemPhase.PHASE_1: PhaseConfig(
+            SystemPhase.PHASE_1: lambda: PhaseConfig(
                 name="Phase 1: CSV-based Q&A",
                 description="Basic semantic search with predefined Q&A pairs",
                 data_source="qa.csv",
                 threshold=0.7,
-                features=[
+                features=(
                     "Basic semantic search",
                     "CSV-based knowledge base", 
                     "Simple Q&A matching",
                     "Confidence scoring"
-                ],
+                ),
                 storage_format="csv_embeddings",
                 embedding_mode="questions_only"
             ),
             
-            SystemPhase.PHASE_2: PhaseConfig(
+            SystemPhase.PHASE_2: lambda: PhaseConfig(
                 name="Phase 2: Content-based Knowledge System", 
                 description="Intelligent document processing with content chunking",
                 data_source="content.txt",
                 threshold=0.5,
-                features=[
+                features=(
                     "Intelligent content parsing",
                     "Automatic document chunking",
                     "Content categorization",
                     "Contextual responses",
                     "Source attribution",
                     "Enhanced similarity matching"
-                ],
+                ),
                 storage_format="content_embeddings",
                 embedding_mode="content_chunks"
             ),
             
-            SystemPhase.PHASE_3: PhaseConfig(
+            SystemPhase.PHASE_3: lambda: PhaseConfig(
                 name="Phase 3: Multi-document Knowledge Fusion",
                 description="Advanced multi-source content processing (Future)",
                 data_source="multiple_sources",
                 threshold=0.4,
-                features=[
+                features=(
                     "Multi-document processing",
                     "Knowledge graph integration",
                     "Cross-reference linking",
                     "Advanced NLP features"
-                ],
+                ),
                 storage_format="graph_embeddings", 
                 embedding_mode="knowledge_graph"
             )
@@ -121,54 +135,78 @@ class VersionManager:
         if target_phase == SystemPhase.AUTO:
             target_phase = self._detect_optimal_phase()
             
-        return self.phase_configs.get(target_phase, self.phase_configs[SystemPhase.PHASE_1])
+        if target_phase not in self.phase_configs:
+            target_phase = SystemPhase.PHASE_1
+        return self.phase_configs[target_phase]
+    
+    def invalidate_cache(self):
+        """Forget memoized phase detection and availability, e.g. after data files change."""
+        self._data_file_sizes = None
+        self._detected_phase = None
+        self._availability = None
+    
+    def _stat_data_files(self) -> Dict[str, Optional[int]]:
+        """Size of each phase data file (None if missing), one os.stat per file per process."""
+        if self._data_file_sizes is None:
+            sizes = {}
+            for path in ("data/qa.csv", "data/content.txt"):
+                try:
+                    sizes[path] = os.stat(path).st_size
+                except FileNotFoundError:
+                    sizes[path] = None
+            self._data_file_sizes = sizes
+        return self._data_file_sizes
     
     def _detect_optimal_phase(self) -> SystemPhase:
         """
         Automatically detect the optimal phase based on available data.
+        The result is memoized until invalidate_cache() is called.
         
         Returns:
             SystemPhase: The detected optimal phase
         """
+        if self._detected_phase is None:
+            self._detected_phase = self._probe_optimal_phase()
+        return self._detected_phase
+    
+    def _probe_optimal_phase(self) -> SystemPhase:
+        """Inspect the data files to pick the optimal phase."""
         # Check for Phase 2 content
-        content_file = Path("data/content.txt")
-        if content_file.exists() and content_file.stat().st_size > 1000:  # Has substantial content
+        content_size = self._stat_data_files()["data/content.txt"]
+        if content_size is not None and content_size > 1000:  # Has substantial content
             return SystemPhase.PHASE_2
         
-        # Check for Phase 1 CSV data
-        csv_file = Path("data/qa.csv") 
-        if csv_file.exists():
-            return SystemPhase.PHASE_1
-            
-        # Default fallback
+        # Phase 1 CSV data or not, Phase 1 is the fallback, so qa.csv needs no probe
         return SystemPhase.PHASE_1
     
     def get_available_phases(self) -> Dict[SystemPhase, PhaseConfig]:
         """Get all available phases and their configurations."""
         available = {}
         
-        for phase, config in self.phase_configs.items():
+        for phase in self.phase_configs:
             if phase == SystemPhase.PHASE_3:  # Skip future phases
                 continue
                 
             # Check if phase data is available
             if self._is_phase_available(phase):
-                available[phase] = config
+                available[phase] = self.phase_configs[phase]
                 
         return available
     
     def _is_phase_available(self, phase: SystemPhase) -> bool:
-        """Check if a phase has the required data available."""
-        config = self.phase_configs[phase]
-        
-        if phase == SystemPhase.PHASE_1:
-            return Path("data/qa.csv").exists()
-        elif phase == SystemPhase.PHASE_2:
-            return Path("data/content.txt").exists()
-        elif phase == SystemPhase.PHASE_3:
-            return False  # Future phase not implemented
-            
-        return False
+        """Check if a phase has the required data available (memoized)."""
+        if self._availability is None:
+            self._availability = self._compute_availability()
+        return self._availability.get(phase, False)
+    
+    def _compute_availability(self) -> Dict[SystemPhase, bool]:
+        """Availability of every phase, derived from the memoized data file stats."""
+        sizes = self._stat_data_files()
+        return {
+            SystemPhase.PHASE_1: sizes["data/qa.csv"] is not None,
+            SystemPhase.PHASE_2: sizes["data/content.txt"] is not None,
+            SystemPhase.PHASE_3: False  # Future phase not implemented
+        }
     
     def get_phase_comparison(self) -> Dict[str, Any]:
         """
@@ -246,17 +284,22 @@ class VersionManager:
         else:
             return base_queries
     
-    def get_version_info(self) -> Dict[str, str]:
-        """Get current version information."""
-        config = self.get_phase_config()
+    def get_version_info(self, phase: Optional[SystemPhase] = None) -> Dict[str, str]:
+        """Get version information for a phase (current phase if None)."""
+        target_phase = phase or self.current_phase
+        config = self.get_phase_config(target_phase)
         
         return {
-            "current_phase": self.current_phase.value,
+            "current_phase": target_phase.value,
             "phase_name": config.name,
             "description": config.description,
             "data_source": config.data_source,
             "features": ", ".join(config.features[:3]) + "..." if len(config.features) > 3 else ", ".join(config.features)
         }
 
-# Global version manager instance
-version_manager = VersionManager()
\ No newline at end of file
+# Global version manager instance, created on first access (PEP 562)
+def __getattr__(name: str):
+    if name == "version_manager":
+        instance = globals()[name] = VersionManager()
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
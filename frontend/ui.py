@@ -1,13 +1,5 @@
 import streamlit as st
-import sys
 import os
-from pathlib import Path
-
-# Add backend to path
-backend_path = Path(__file__).parent.parent / "backend"
-sys.path.append(str(backend_path))
-
-from services.chatbot_service import ChatbotService
 
 class ChatbotUI:
     def __init__(self):
@@ -22,15 +14,19 @@ class ChatbotUI:
         )
     
     def initialize_session_state(self):
-        if "messages" not in st.session_state:
+        # Runs on every Streamlit rerun; only the first run of a session sets state
+        if "initialized" not in st.session_state:
             st.session_state.messages = []
-        
-        if "chatbot_service" not in st.session_state:
             st.session_state.chatbot_service = None
             st.session_state.initialized = False
+            st.session_state.rendered_count = 0
     
     @st.cache_resource
     def initialize_chatbot_service(_self):
+        # Deferred so the header and sidebar render before the backend stack
+        # (numpy, the encoder) is imported; cache_resource runs this once per process
+        from backend.services.chatbot_service import ChatbotService
+        
         service = ChatbotService()
         if service.initialize():
             return service
@@ -49,19 +45,18 @@ class ChatbotUI:
             st.markdown("---")
             st.subheader("🔧 Settings")
             
-            # Threshold adjustment
-            threshold = st.slider(
+            # Threshold adjustment; kept in session state and sent with each query,
+            # since the cached ChatbotService is shared by every session
+            st.slider(
                 "Similarity Threshold",
                 min_value=0.1,
                 max_value=1.0,
                 value=0.7,
                 step=0.1,
+                key="threshold",
                 help="Lower values return more results but may be less accurate"
             )
             
-            if st.session_state.chatbot_service:
-                st.session_state.chatbot_service.update_threshold(threshold)
-            
             st.markdown("---")
             st.markdown("**Sample Questions:**")
             st.markdown("- What is Ejari?")
@@ -69,11 +64,21 @@ class ChatbotUI:
             st.markdown("- What documents are required?")
     
     def render_chat_history(self):
+        # Full script runs render the whole history once; input-only reruns are
+        # handled by the handle_user_input fragment and never reach this loop
         for message in st.session_state.messages:
             with st.chat_message(message["role"]):
                 st.markdown(message["content"])
+        st.session_state.rendered_count = len(st.session_state.messages)
     
+    @st.fragment
     def handle_user_input(self):
+        # A fragment rerun replaces only its own output, so re-emit the messages
+        # added since the last full run, not the whole history
+        for message in st.session_state.messages[st.session_state.rendered_count:]:
+            with st.chat_message(message["role"]):
+                st.markdown(message["content"])
+        
         if prompt := st.chat_input("Ask me anything about Ejari..."):
             # Add user message to chat history
             st.session_state.messages.append({"role": "user", "content": prompt})
@@ -84,7 +89,9 @@ class ChatbotUI:
             if st.session_state.chatbot_service:
                 with st.chat_message("assistant"):
                     with st.spinner("Searching for answer..."):
-                        response = st.session_state.chatbot_service.process_query(prompt)
+                        response = st.session_state.chatbot_service.process_query(
+                            prompt, threshold=st.session_state.threshold
+                        )
                     st.markdown(response)
                 
                 # Add assistant response to chat history
@@ -1,13 +1,7 @@
 #!/usr/bin/env python3
 
-import sys
-from pathlib import Path
-
-# Add backend to path
-backend_path = Path(__file__).parent / "backend"
-sys.path.append(str(backend_path))
-
-from services.chatbot_service import ChatbotService
+from backend.services.chatbot_service import ChatbotService
+from backend.services.semantic_search import SemanticSearch
 
 def test_chatbot():
     print("Testing Ejari Chatbot Backend...")
@@ -31,12 +25,15 @@ def test_chatbot():
     ]
     
     print("\n🧪 Testing queries:")
+    errors = 0
     for query in test_queries:
         print(f"\n❓ Query: {query}")
         response = service.process_query(query)
         print(f"💬 Response: {response}")
+        if response.startswith(SemanticSearch.ERROR):
+            errors += 1
     
-    return True
+    return errors == 0
 
 if __name__ == "__main__":
     success = test_chatbot()
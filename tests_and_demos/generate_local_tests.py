@@ -5,14 +5,9 @@ These generated scripts are for local testing only - not committed to git.
 Follows development guidelines for release testing.
 """
 
-import sys
 from pathlib import Path
 
-# Add backend to path
-backend_path = Path(__file__).parent / "backend"
-sys.path.append(str(backend_path))
-
-from utils.release_manager import release_manager, ReleaseVersion
+from backend.utils.release_manager import release_manager, ReleaseVersion
 
 def generate_all_local_tests():
     """Generate local test scripts for all releases."""
@@ -114,14 +109,7 @@ Local comparison test script - Not committed to git
 Generated by ReleaseManager following development guidelines
 """
 
-import sys
-from pathlib import Path
-
-# Add backend to path
-backend_path = Path(__file__).parent / "backend"
-sys.path.append(str(backend_path))
-
-from utils.release_manager import release_manager, ReleaseVersion
+from backend.utils.release_manager import release_manager, ReleaseVersion
 
 def run_comparison():
     """Run comparison between all implemented releases."""
@@ -3,24 +3,50 @@
 Test script for the enhanced semantic search system with content chunks.
 """
 
+import functools
+import io
 import sys
-from pathlib import Path
+import time
+from contextlib import contextmanager
 
-# Add backend to path
-backend_path = Path(__file__).parent / "backend"
-sys.path.append(str(backend_path))
+from backend.services.semantic_search import SemanticSearch
 
-from services.semantic_search import SemanticSearch
+@functools.lru_cache(maxsize=2)
+def _get_system(mode: str) -> SemanticSearch:
+    """
+    Shared SemanticSearch per mode ("content" or "csv").
+    The tests below build on each other's state (data, model, embeddings)
+    instead of reloading the model and re-embedding the corpus every time.
+    """
+    search_system = SemanticSearch()
+    search_system.use_content_mode = mode == "content"
+    return search_system
+
+@contextmanager
+def timed(name: str, timings: dict):
+    """Record the wall time of the enclosed block (in ms) under ``name``."""
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        timings[name] = (time.perf_counter_ns() - start) / 1e6
+
+def print_timings(timings: dict):
+    """Print one summary table of the recorded sub-test timings."""
+    if not timings:
+        return
+    width = max(len(name) for name in timings)
+    print("\nTimings:")
+    for name, ms in timings.items():
+        print(f"  {name:<{width}}  {ms:10.1f} ms")
+    print(f"  {'total':<{width}}  {sum(timings.values()):10.1f} ms")
 
-def test_content_parsing():
+def test_content_parsing(search_system):
     """Test the content parsing functionality."""
     print("=" * 60)
     print("TESTING CONTENT PARSING")
     print("=" * 60)
     
-    # Initialize the semantic search system
-    search_system = SemanticSearch()
-    
     # Load and parse content
     if search_system.load_data():
         print("✓ Content loading successful")
@@ -31,31 +57,30 @@ def test_content_parsing():
         
         if search_system.content_chunks:
             print(f"\nFirst few content chunks:")
-            for i, chunk in enumerate(search_system.content_chunks[:3]):
+            chunks = search_system.content_chunks
+            for i, (content, context, chunk_type) in enumerate(zip(chunks.content[:3], chunks.context, chunks.type)):
                 print(f"\nChunk {i+1}:")
-                print(f"  Context: {chunk['context']}")
-                print(f"  Type: {chunk['type']}")
-                print(f"  Content: {chunk['content'][:200]}...")
+                print(f"  Context: {context}")
+                print(f"  Type: {chunk_type}")
+                print(f"  Content: {content[:200]}...")
         
         return True
     else:
         print("✗ Content loading failed")
         return False
 
-def test_model_loading():
+def test_model_loading(search_system):
     """Test model loading."""
     print("\n" + "=" * 60)
     print("TESTING MODEL LOADING")
     print("=" * 60)
     
-    search_system = SemanticSearch()
-    
     if search_system.load_model():
         print("✓ Model loading successful")
-        return search_system
+        return True
     else:
         print("✗ Model loading failed")
-        return None
+        return False
 
 def test_embedding_generation(search_system):
     """Test embedding generation."""
@@ -63,13 +88,13 @@ def test_embedding_generation(search_system):
     print("TESTING EMBEDDING GENERATION")
     print("=" * 60)
     
-    # Load data first
-    if not search_system.load_data():
+    # Load data first (already parsed by test_content_parsing on the shared system)
+    if not search_system.content_chunks and not search_system.load_data():
         print("✗ Could not load data for embedding generation")
         return False
     
     # Generate embeddings
-    if search_system.generate_embeddings():
+    if search_system.embeddings is not None or search_system.generate_embeddings():
         print("✓ Embedding generation successful")
         print(f"Generated embeddings shape: {search_system.embeddings.shape}")
         return True
@@ -83,8 +108,8 @@ def test_search_functionality(search_system):
     print("TESTING SEARCH FUNCTIONALITY")
     print("=" * 60)
     
-    # Initialize the system
-    if not search_system.initialize():
+    # Initialize the system unless the earlier tests already did
+    if search_system.embeddings is None and not search_system.initialize():
         print("✗ System initialization failed")
         return False
     
@@ -99,25 +124,22 @@ def test_search_functionality(search_system):
     ]
     
     print("Testing search queries:")
-    for i, query in enumerate(test_queries, 1):
-        print(f"\n{i}. Query: '{query}'")
-        print("-" * 50)
-        
-        response = search_system.search(query)
-        print(f"Response: {response}")
+    responses = search_system.search_batch(test_queries)
+    report = io.StringIO()
+    for i, (query, response) in enumerate(zip(test_queries, responses), 1):
+        print(f"\n{i}. Query: '{query}'", file=report)
+        print("-" * 50, file=report)
+        print(f"Response: {response}", file=report)
+    sys.stdout.write(report.getvalue())
     
     return True
 
-def test_backward_compatibility():
+def test_backward_compatibility(search_system):
     """Test backward compatibility with CSV mode."""
     print("\n" + "=" * 60)
     print("TESTING BACKWARD COMPATIBILITY (CSV MODE)")
     print("=" * 60)
     
-    # Create system with content mode disabled
-    search_system = SemanticSearch()
-    search_system.use_content_mode = False
-    
     if search_system.initialize():
         print("✓ CSV mode initialization successful")
         
@@ -134,30 +156,43 @@ def main():
     print("Enhanced Semantic Search System - Test Suite")
     print("=" * 60)
     
+    timings = {}
     try:
+        # One content-mode system is shared by tests 1-4
+        search_system = _get_system("content")
+        
         # Test 1: Content parsing
-        if not test_content_parsing():
+        with timed("content_parsing", timings):
+            passed = test_content_parsing(search_system)
+        if not passed:
             print("\n❌ Content parsing test failed")
             return
         
         # Test 2: Model loading
-        search_system = test_model_loading()
-        if not search_system:
+        with timed("model_loading", timings):
+            passed = test_model_loading(search_system)
+        if not passed:
             print("\n❌ Model loading test failed")
             return
         
         # Test 3: Embedding generation
-        if not test_embedding_generation(search_system):
+        with timed("embedding_generation", timings):
+            passed = test_embedding_generation(search_system)
+        if not passed:
             print("\n❌ Embedding generation test failed")
             return
         
         # Test 4: Search functionality
-        if not test_search_functionality(search_system):
+        with timed("search_functionality", timings):
+            passed = test_search_functionality(search_system)
+        if not passed:
             print("\n❌ Search functionality test failed")
             return
         
         # Test 5: Backward compatibility
-        if not test_backward_compatibility():
+        with timed("backward_compatibility", timings):
+            passed = test_backward_compatibility(_get_system("csv"))
+        if not passed:
             print("\n⚠️  Backward compatibility test failed (CSV mode)")
         
         print("\n" + "=" * 60)
@@ -172,6 +207,8 @@ def main():
         print(f"\n❌ Test suite failed with error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        print_timings(timings)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
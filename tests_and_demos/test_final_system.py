@@ -3,17 +3,17 @@
 Final test script to validate the enhanced content-based system.
 """
 
+import io
 import sys
-from pathlib import Path
 
-# Add backend to path
-backend_path = Path(__file__).parent / "backend"
-sys.path.append(str(backend_path))
+from backend.services.semantic_search import SemanticSearch
 
-from services.semantic_search import SemanticSearch
-
-def test_enhanced_queries():
-    """Test the system with various queries to show improvement."""
+def test_enhanced_queries(fast: bool = False):
+    """
+    Test the system with various queries to show improvement.
+    With fast=True, queries are searched one at a time and the loop stops as
+    soon as the 70% pass/fail outcome is decided (the per-query log is cut short).
+    """
     print("Enhanced Content-Based Semantic Search - Final Test")
     print("=" * 60)
     
@@ -30,89 +30,85 @@ def test_enhanced_queries():
     print("TESTING VARIOUS QUERIES")
     print("=" * 60)
     
-    # Test comprehensive queries
+    # Test comprehensive queries, with what each should answer kept in a parallel list
     test_queries = [
-        {
-            "query": "What is EJARI?",
-            "expected": "definition of EJARI program"
-        },
-        {
-            "query": "How do I register a tenancy contract?",
-            "expected": "registration process information"
-        },
-        {
-            "query": "What documents are required for registration?",
-            "expected": "required documents information"
-        },
-        {
-            "query": "What are the rent increase percentages in Dubai?",
-            "expected": "rent increase rates"
-        },
-        {
-            "query": "Who can use EJARI system?",
-            "expected": "user types and requirements"
-        },
-        {
-            "query": "What is the vision of RERA?",
-            "expected": "RERA vision statement"
-        },
-        {
-            "query": "What are landlord obligations?",
-            "expected": "landlord responsibilities"
-        },
-        {
-            "query": "What is the eviction process?",
-            "expected": "eviction procedures"
-        },
-        {
-            "query": "Training requirements for EJARI",
-            "expected": "training information"
-        },
-        {
-            "query": "Property management companies requirements",
-            "expected": "company requirements"
-        }
+        "What is EJARI?",
+        "How do I register a tenancy contract?",
+        "What documents are required for registration?",
+        "What are the rent increase percentages in Dubai?",
+        "Who can use EJARI system?",
+        "What is the vision of RERA?",
+        "What are landlord obligations?",
+        "What is the eviction process?",
+        "Training requirements for EJARI",
+        "Property management companies requirements"
+    ]
+    expected_answers = [
+        "definition of EJARI program",
+        "registration process information",
+        "required documents information",
+        "rent increase rates",
+        "user types and requirements",
+        "RERA vision statement",
+        "landlord responsibilities",
+        "eviction procedures",
+        "training information",
+        "company requirements"
     ]
     
     successful_responses = 0
+    failed_responses = 0
+    required = -(-len(test_queries) * 7 // 10)  # 70% success rate, rounded up
     
-    for i, test_case in enumerate(test_queries, 1):
-        query = test_case["query"]
-        expected = test_case["expected"]
-        
-        print(f"\n{i}. Query: '{query}'")
-        print(f"   Expected: {expected}")
-        print("-" * 50)
-        
-        response = search_system.search(query)
+    if fast:
+        # Search lazily so an early exit skips encoding the remaining queries
+        responses = (search_system.search(query) for query in test_queries)
+    else:
+        # Encode and score every query in one batch
+        responses = search_system.search_batch(test_queries)
+    
+    # Collect the per-query report and write it to stdout in one go
+    report = io.StringIO()
+    for i, (query, expected, response) in enumerate(zip(test_queries, expected_answers, responses), 1):
+        print(f"\n{i}. Query: '{query}'", file=report)
+        print(f"   Expected: {expected}", file=report)
+        print("-" * 50, file=report)
         
-        # Check if we got a meaningful response (not the "I don't have enough information" message)
-        if "I'm sorry, I don't have enough information" not in response:
+        # Check if we got a meaningful response (not the "I don't have enough information" message or an error)
+        if SemanticSearch.is_answer(response):
             successful_responses += 1
-            print(f"✓ SUCCESS: Got relevant response")
+            print(f"✓ SUCCESS: Got relevant response", file=report)
             # Show first 150 chars of response
             response_preview = response[:150] + "..." if len(response) > 150 else response
-            print(f"   Response: {response_preview}")
+            print(f"   Response: {response_preview}", file=report)
         else:
-            print(f"✗ FAILED: {response}")
+            failed_responses += 1
+            print(f"✗ FAILED: {response}", file=report)
+        
+        if fast and (successful_responses >= required
+                     or failed_responses > len(test_queries) - required):
+            print(f"\n(--fast: outcome decided after {i}/{len(test_queries)} queries)", file=report)
+            break
+    sys.stdout.write(report.getvalue())
     
     print("\n" + "=" * 60)
     print("FINAL RESULTS")
     print("=" * 60)
-    print(f"Successful responses: {successful_responses}/{len(test_queries)}")
-    print(f"Success rate: {(successful_responses/len(test_queries)*100):.1f}%")
+    evaluated = successful_responses + failed_responses
+    print(f"Successful responses: {successful_responses}/{evaluated}")
+    print(f"Success rate: {(successful_responses/evaluated*100):.1f}%")
     
-    if successful_responses >= len(test_queries) * 0.7:  # 70% success rate
+    if successful_responses >= required:
         print("🎉 ENHANCED SYSTEM PERFORMING WELL!")
     else:
         print("⚠️  System needs further optimization")
     
-    return successful_responses >= len(test_queries) * 0.7
+    return successful_responses >= required
 
 def main():
-    """Run the final test."""
+    """Run the final test. Pass --fast to stop once the outcome is decided."""
     try:
-        success = test_enhanced_queries()
+        success = test_enhanced_queries(fast="--fast" in sys.argv[1:])
         
         if success:
             print("\n✅ Phase 2 Implementation Complete!")